@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Demo driver for the Sruvaan secure prompt pipeline.
+
+Runs a handful of sample instructions through the pipeline stages,
+overlapping the per-input work instead of processing them serially: the
+prompter calls are network-bound and the cryptor calls release the GIL
+inside hashlib, so both stages benefit from a thread pool.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from src.cryptor import run_cryptor
+from src.decryptor import run_decryptor
+from src.mimicus import run_mimicus
+from src.probator import run_probator
+from src.praeceptor import run_praeceptor
+from src.prompter import run_prompter
+from src.schemas import RawInstructionInput
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_INSTRUCTIONS = [
+    "Transfer $5,000 to account 9876-5432-1098 from 1234-5678-9012",
+    "Send an email to Priya about the quarterly report",
+    "Book a flight to Chennai for next Monday",
+]
+
+
+def run_agent_showcase():
+    """Individual Agent Showcase: each stage over all samples, in parallel."""
+    print("=== Individual Agent Showcase ===")
+    inputs = [RawInstructionInput(instruction=i) for i in SAMPLE_INSTRUCTIONS]
+    with ThreadPoolExecutor() as pool:
+        semantic_outs = list(pool.map(run_prompter, inputs))
+        encrypted_outs = list(pool.map(run_cryptor, semantic_outs))
+        decrypted_outs = list(pool.map(run_decryptor, encrypted_outs))
+        mimic_outs = list(pool.map(run_mimicus, decrypted_outs))
+        leakage_outs = list(
+            pool.map(
+                lambda pair: run_probator(*pair),
+                zip(mimic_outs, decrypted_outs),
+            )
+        )
+        theta_outs = list(pool.map(run_praeceptor, leakage_outs))
+
+    for instruction, semantic, encrypted, decrypted, mimic, leakage, theta in zip(
+        SAMPLE_INSTRUCTIONS,
+        semantic_outs,
+        encrypted_outs,
+        decrypted_outs,
+        mimic_outs,
+        leakage_outs,
+        theta_outs,
+    ):
+        print(f"\nInstruction: {instruction}")
+        print(f"  Prompter:   intent={semantic.intent} "
+              f"entities={semantic.entities}")
+        print(f"  Cryptor:    pop={encrypted.pop_signature} "
+              f"fields={list(encrypted.encrypted_fields)}")
+        print(f"  Decryptor:  intent={decrypted.intent} "
+              f"pop_verified={decrypted.pop_verified}")
+        print(f"  Mimicus:    fields={list(mimic.mimic_fields)} "
+              f"vulnerabilities={len(mimic.vulnerabilities)}")
+        print(f"  Probator:   leakage={leakage.leakage_score:.3f} "
+              f"hkp={leakage.hkp_score:.3f}")
+        print(f"  Praeceptor: mode={theta.calibration_mode} "
+              f"theta={theta.theta_update}")
+
+
+def main():
+    logging.basicConfig(
+        level=logging.WARNING,
+        format="%(levelname)s %(name)s: %(message)s",
+    )
+    run_agent_showcase()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Sruvaan secure prompt pipeline."""
@@ -0,0 +1,256 @@
+"""Configuration loading for the Sruvaan pipeline.
+
+Loads environment variables from ``.env`` and agent prompt templates from
+``templates/*.yaml``.  Parsed templates are cached in ``templates/.cache.pkl``
+keyed by file fingerprints (path, mtime, size) so repeated process starts skip
+the YAML parse entirely.  The module-level ``config`` singleton is created
+lazily via PEP 562 so importing ``src.config`` costs nothing until the
+configuration is actually needed.
+"""
+
+import logging
+import os
+import pickle
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is the fallback
+    orjson = None
+
+import json
+
+logger = logging.getLogger(__name__)
+
+ENV_FILE = Path(".env")
+
+# (mtime_ns, size) of the last .env parse; repeated Config() constructions
+# in one process skip the file read entirely when unchanged.
+_env_cache = {"fingerprint": None, "values": {}}
+
+TEMPLATES_DIR = Path("templates")
+_TEMPLATE_CACHE = ".cache.pkl"
+
+# Default prompt templates for each pipeline agent, written out as
+# templates/<agent>.yaml on first run so deployments can edit them.
+DEFAULT_TEMPLATES = {
+    "prompter": {
+        "system_prompt": (
+            "You are an instruction parser for a secure execution pipeline. "
+            "Extract the intent, entities and authorization level from the "
+            "user instruction and answer with JSON only."
+        ),
+        "user_prompt": (
+            "Parse the following instruction into JSON with keys intent, "
+            "entities, auth_level, timestamp, status:\n\n{instruction}"
+        ),
+    },
+    "cryptor": {
+        "system_prompt": (
+            "You are a hierarchical key protection (HKP) encryption agent. "
+            "Transform semantic fields into role-gated encrypted tokens and "
+            "answer with JSON only."
+        ),
+        "user_prompt": (
+            "Encrypt the following semantic fields using HKP notation "
+            "(keys such as Ωα, βΞ, Role=Γ5, Time=∆τ):\n\n{semantic_fields}"
+        ),
+    },
+    "decryptor": {
+        "system_prompt": (
+            "You are an HKP decryption agent. Recover semantic fields from "
+            "encrypted tokens when the role tag authorizes it and answer "
+            "with JSON only."
+        ),
+        "user_prompt": (
+            "Decrypt the following HKP fields and report the recovered "
+            "entities and verification status:\n\n{encrypted_fields}"
+        ),
+    },
+    "mimicus": {
+        "system_prompt": (
+            "You are an adversarial mimic agent. Given decrypted pipeline "
+            "fields, produce plausible mimic fields an attacker could forge "
+            "and answer with JSON only."
+        ),
+        "user_prompt": (
+            "Generate mimic fields for the following decrypted data:\n\n"
+            "{decrypted_fields}"
+        ),
+    },
+    "probator": {
+        "system_prompt": (
+            "You are a leakage assessment agent. Compare mimic fields with "
+            "the protected originals and score the information leakage. "
+            "Answer with JSON only."
+        ),
+        "user_prompt": (
+            "Assess the leakage risk of these mimic fields:\n\n{mimic_fields}"
+        ),
+    },
+    "praeceptor": {
+        "system_prompt": (
+            "You are a calibration agent. Given a leakage assessment, "
+            "propose updated cipher parameters (theta) for the pipeline. "
+            "Answer with JSON only."
+        ),
+        "user_prompt": (
+            "Calibrate theta parameters from this leakage assessment:\n\n"
+            "{leakage_assessment}"
+        ),
+    },
+}
+
+
+def _parse_env_file(path):
+    """Minimal .env parser: KEY=VALUE lines, comments and quotes allowed."""
+    values = {}
+    for line in path.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, _, value = line.partition("=")
+        values[key.strip()] = value.strip().strip("'\"")
+    return values
+
+
+def load_environment():
+    """Merge ``.env`` values into ``os.environ`` without building templates.
+
+    Availability probes (the LLM clients' key checks) call this directly
+    so keys that live only in the env file are visible before the full
+    ``Config`` singleton is ever constructed.
+    """
+    try:
+        st = ENV_FILE.stat()
+        fingerprint = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        fingerprint = None
+    if fingerprint is not None and fingerprint != _env_cache["fingerprint"]:
+        _env_cache["values"] = _parse_env_file(ENV_FILE)
+        _env_cache["fingerprint"] = fingerprint
+    for key, value in _env_cache["values"].items():
+        os.environ.setdefault(key, value)
+
+
+class Config:
+    """Process-wide configuration: environment secrets and agent templates."""
+
+    def __init__(self):
+        self._load_environment()
+        self.templates = self._load_templates()
+
+    def _load_environment(self):
+        load_environment()
+        # Resolve the secrets once; callers read the attributes instead of
+        # hitting os.getenv repeatedly.
+        self.groq_api_key = os.getenv("GROQ_API_KEY")
+        self.openai_api_key = os.getenv("OPENAI_API_KEY")
+        self.anthropic_api_key = os.getenv("ANTHROPIC_API_KEY")
+
+    @staticmethod
+    def _fingerprint(entries):
+        """Stable fingerprint of the template files: (path, mtime_ns, size).
+
+        DirEntry.stat() is served from the scandir cache, so this adds no
+        extra syscalls.
+        """
+        return tuple(
+            (e.path, st.st_mtime_ns, st.st_size)
+            for e in entries
+            for st in (e.stat(),)
+        )
+
+    @staticmethod
+    def _template_files():
+        """Template dir entries by stem, preferring .json over .yaml twins.
+
+        os.scandir is one syscall returning lightweight DirEntry objects
+        with cached stat data; no Path objects or fnmatch on this path.
+        """
+        yaml_entries, json_entries = {}, {}
+        with os.scandir(TEMPLATES_DIR) as it:
+            for entry in it:
+                if entry.name.endswith(".yaml"):
+                    yaml_entries[entry.name[:-5]] = entry
+                elif entry.name.endswith(".json"):
+                    json_entries[entry.name[:-5]] = entry
+        by_stem = {**yaml_entries, **json_entries}
+        return [by_stem[stem] for stem in sorted(by_stem)]
+
+    def _load_templates(self):
+        TEMPLATES_DIR.mkdir(exist_ok=True)
+        template_files = self._template_files()
+        if not template_files:
+            self._create_default_templates()
+            template_files = self._template_files()
+
+        fingerprint = self._fingerprint(template_files)
+        cache_path = TEMPLATES_DIR / _TEMPLATE_CACHE
+        try:
+            with open(cache_path, "rb") as f:
+                cached = pickle.load(f)
+            if cached.get("fingerprint") == fingerprint:
+                return cached["templates"]
+        except (OSError, pickle.PickleError, EOFError, KeyError):
+            pass
+
+        templates = {}
+        for entry in template_files:
+            with open(entry.path, "rb") as f:
+                if entry.name.endswith(".json"):
+                    raw = f.read()
+                    data = (
+                        orjson.loads(raw) if orjson is not None else json.loads(raw)
+                    )
+                else:
+                    # Deferred: pyyaml is only imported when .yaml templates
+                    # actually exist (the shipped defaults are .json). The C
+                    # loader is ~10x faster than the pure-Python one.
+                    import yaml
+
+                    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+                    data = yaml.load(f, Loader=loader)
+            if data:
+                templates[entry.name.rsplit(".", 1)[0]] = data
+
+        # Rewrite the cache atomically so a crashed writer never leaves a
+        # truncated pickle behind.
+        tmp_path = cache_path.with_suffix(".pkl.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(
+                    {"fingerprint": fingerprint, "templates": templates},
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            logger.debug("Could not write template cache %s", cache_path)
+
+        return templates
+
+    def _create_default_templates(self):
+        # JSON defaults: serialized in one shot and loaded back 10-50x
+        # faster than a pyyaml round-trip. User-edited .yaml files are
+        # still accepted by _load_templates.
+        for name, template_data in DEFAULT_TEMPLATES.items():
+            if orjson is not None:
+                payload = orjson.dumps(
+                    template_data, option=orjson.OPT_INDENT_2
+                )
+            else:
+                payload = json.dumps(template_data, indent=2).encode()
+            (TEMPLATES_DIR / f"{name}.json").write_bytes(payload)
+        logger.info("Created default templates in %s", TEMPLATES_DIR)
+
+    def get_template(self, name):
+        return self.templates.get(name)
+
+
+def __getattr__(name):
+    """Build the ``config`` singleton lazily on first attribute access."""
+    if name == "config":
+        globals()["config"] = Config()
+        return globals()["config"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
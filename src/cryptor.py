@@ -0,0 +1,358 @@
+"""Cryptor agent: turns semantic prompts into HKP-encrypted field tokens.
+
+The fallback (LLM-free) path derives the obfuscated metadata fields from a
+single SHA-256 digest over the canonical prompt content, encrypts each
+semantic entity under a role-gated key (hierarchical key protection, HKP),
+and signs the result with a proof-of-possession (PoP) signature.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from . import cryptor_fastpath
+from .llm_client import llm_client
+from .schemas import EncryptedOutput, SemanticPromptOut
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is the fallback
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Bound once so hot calls skip the module-attribute lookup; the constructor
+# itself is thread-safe, so no thread-local indirection is needed.
+_sha256 = hashlib.sha256
+
+# Field-key layout is fixed; keeping the (interned) keys in one tuple lets
+# every call reuse the cached string hashes of the multi-byte keys instead of
+# rebuilding a dict literal.
+_FIELD_KEYS = ("Ωα", "βΞ", "$γΦ", "Node_ζτ", "Role=Γ5", "Time=∆τ")
+
+# Prefix for per-entity encrypted field keys.
+ENTITY_PREFIX = "βΞ_"
+
+# blake2s produces truncated digests natively (no hexdigest-then-slice pass)
+# and is faster than SHA-256 for the short inputs the HKP layer hashes.
+# SHA-256 stays selectable for signatures issued by older deployments.
+_USE_SHA256_COMPAT = os.getenv("HKP_HASH", "blake2s").lower() == "sha256"
+
+# LLM availability cannot change mid-process (keys and SDKs are resolved at
+# import), so decide once here instead of re-reading the environment and
+# serializing the prompt on every call just to learn the answer is None.
+# The probe itself merges .env into os.environ first, so keys living only
+# in the env file are seen even though this runs at import.
+_LLM_ONLY = os.getenv("LLM_ONLY_MODE", "false").lower() == "true"
+_LLM_AVAILABLE = llm_client.has_any_client
+
+_ts_cache = [0, ""]
+
+
+def _iso_timestamp() -> str:
+    """ISO-8601 UTC timestamp cached at one-second resolution.
+
+    Access-control tags only need epoch-second granularity, so the
+    formatted string is memoized per second: most calls reduce to one
+    ``time.time()`` and a list index, with no datetime objects involved.
+    """
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[0] = now
+        _ts_cache[1] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+    return _ts_cache[1]
+
+
+def _dumps_canonical(obj) -> bytes:
+    """Key-sorted JSON bytes, used to stabilize dicts for hashing.
+
+    ``default=dict`` lets mapping proxies (the prompter's shared
+    empty-entities singleton) serialize as their backing dict.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS, default=dict)
+    return json.dumps(
+        obj, sort_keys=True, separators=(",", ":"), default=dict
+    ).encode()
+
+
+def _dumps_text(obj) -> str:
+    """Compact JSON text for LLM payloads, preferring the orjson encoder."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=dict).decode()
+    return json.dumps(obj, separators=(",", ":"), default=dict)
+
+
+def _trunc_hash(data: bytes, nbytes: int) -> str:
+    """Hex digest of *data* truncated to ``2 * nbytes`` characters."""
+    if _USE_SHA256_COMPAT:
+        return hashlib.sha256(data).hexdigest()[: 2 * nbytes]
+    return hashlib.blake2s(data, digest_size=nbytes).hexdigest()
+
+
+def _batch_trunc_hash(bufs: List[bytes], nbytes: int) -> List[str]:
+    """Truncated digests for a list of independent buffers.
+
+    This is the single seam for the per-field hash fan-out: the buffers
+    carry no data dependencies, so a multi-buffer SIMD backend (e.g.
+    ISA-L ``sha256_mb``) can be dropped in here without touching callers.
+    The portable implementation dispatches to hashlib one buffer at a time;
+    in SHA-256 compatibility mode a Numba-compiled batch kernel takes over
+    for batches of short messages.
+    """
+    if (
+        _USE_SHA256_COMPAT
+        and cryptor_fastpath.HAVE_NUMBA
+        and len(bufs) >= 8
+        and all(len(b) <= cryptor_fastpath.MAX_MESSAGE_LEN for b in bufs)
+    ):
+        return cryptor_fastpath.sha256_trunc_batch(bufs, nbytes)
+    return [_trunc_hash(buf, nbytes) for buf in bufs]
+
+
+@functools.lru_cache(maxsize=256)
+def _role_key_table(auth_level: str, cipher_strength: float) -> tuple:
+    """Memo table and key-material tail for one (auth, strength) pair.
+
+    Key derivation is pure in its three inputs, and the feedback loop
+    re-derives the same handful of field keys on every iteration; after
+    the first pass the derivation cost drops to a dict lookup.  The
+    ``_{auth}_{strength}`` tail is invariant per pair, so it is encoded
+    here once instead of per call (or per batch) at the derivation sites.
+    """
+    return {}, f"_{auth_level}_{cipher_strength}".encode()
+
+
+def _expand_material(material_hex: str) -> tuple:
+    """Split one hash output into a (key id, keystream key) pair.
+
+    HKDF-expand style: a single PRF invocation per field yields both the
+    public ``HKP_`` id (first 4 bytes) and the 32-byte keystream key,
+    instead of one hash for the id and another to seed the keystream.
+    """
+    material = bytes.fromhex(material_hex)
+    return f"HKP_{material[:4].hex()}", material
+
+
+def _derive_role_entry(
+    field_name: str, auth_level: str, theta_params: Optional[dict]
+) -> tuple:
+    """(key id, keystream material) for one semantic field, memoized."""
+    cipher_strength = (theta_params or {}).get("cipher_strength", 0.8)
+    table, tail = _role_key_table(auth_level, cipher_strength)
+    entry = table.get(field_name)
+    if entry is None:
+        entry = _expand_material(_trunc_hash(field_name.encode() + tail, 32))
+        table[field_name] = entry
+    return entry
+
+
+def derive_role_key(
+    field_name: str, auth_level: str, theta_params: Optional[dict]
+) -> str:
+    """Derive the role-gated key id for one semantic field."""
+    return _derive_role_entry(field_name, auth_level, theta_params)[0]
+
+
+def _derive_role_entries(
+    field_names: List[str], auth_level: str, theta_params: Optional[dict]
+) -> List[tuple]:
+    """Batch counterpart of :func:`_derive_role_entry` for many fields."""
+    cipher_strength = (theta_params or {}).get("cipher_strength", 0.8)
+    table, tail = _role_key_table(auth_level, cipher_strength)
+    missing = [name for name in field_names if name not in table]
+    if missing:
+        # The auth/strength tail comes pre-encoded with the table: join
+        # bytes per field instead of formatting an f-string each time.
+        key_inputs = [name.encode() + tail for name in missing]
+        for name, h in zip(missing, _batch_trunc_hash(key_inputs, 32)):
+            table[name] = _expand_material(h)
+    return [table[name] for name in field_names]
+
+
+def _keystream(key, n: int) -> bytes:
+    """Deterministic keystream for *key*: blake2s in counter mode.
+
+    *key* is the raw 32-byte material from derivation; string key ids are
+    accepted for standalone callers and encoded on the fly.
+    """
+    if isinstance(key, str):
+        key = key.encode()
+    out = bytearray()
+    counter = 0
+    while len(out) < n:
+        out += hashlib.blake2s(
+            key + counter.to_bytes(4, "big"), digest_size=32
+        ).digest()
+        counter += 1
+    return bytes(out[:n])
+
+
+def encrypt_field(value: str, key, prefix_bytes: bytes = None) -> str:
+    """Encrypt one field value under a role key.
+
+    The value is XORed against a keystream derived from the key, so the
+    decryptor can recover it when it can re-derive the same key.  Batch
+    callers pass two *prefix_bytes* sliced from a shared urandom pool;
+    standalone calls draw their own.
+    """
+    if prefix_bytes is None:
+        prefix = secrets.token_hex(2).upper()
+    else:
+        prefix = prefix_bytes.hex().upper()
+    data = value.encode()
+    cipher = bytes(a ^ b for a, b in zip(data, _keystream(key, len(data))))
+    return f"{prefix}_{cipher.hex()}"
+
+
+def apply_hkp_encryption(
+    semantic_input: SemanticPromptOut, theta_params: Optional[dict]
+) -> Dict[str, str]:
+    """Encrypt the intent and every entity under role-gated keys.
+
+    Field names and values are gathered in one pass and the key
+    derivations go through the batched hash helper, so the per-field
+    Python/C boundary cost is paid once per batch rather than per field.
+    """
+    auth_level = semantic_input.auth_level or "L0"
+    names = ["intent", *semantic_input.entities.keys()]
+    values = [
+        semantic_input.intent,
+        *(str(v) for v in semantic_input.entities.values()),
+    ]
+    entries = _derive_role_entries(names, auth_level, theta_params)
+    # One urandom draw covers every field prefix: the per-call entropy-pool
+    # locking and object churn of secrets.token_hex is paid once per batch.
+    pool = os.urandom(2 * len(names))
+    return {
+        ENTITY_PREFIX
+        + name: encrypt_field(value, entry[1], pool[2 * i : 2 * i + 2])
+        for i, (name, value, entry) in enumerate(zip(names, values, entries))
+    }
+
+
+def _canonical_bytes(d: Dict[str, str]) -> bytes:
+    """Canonical byte serialization of a flat dict for signing.
+
+    Sorted keys with 0x1f/0x1e separators: stable under key reordering
+    like ``json.dumps(..., sort_keys=True)`` but without the recursive
+    encoder walk and unicode-escape pass.
+    """
+    buf = bytearray()
+    for key in sorted(d):
+        buf += key.encode()
+        buf.append(31)
+        buf += str(d[key]).encode()
+        buf.append(30)
+    return bytes(buf)
+
+
+# Keyed BLAKE2s acts as the PoP MAC: one primitive produces a native
+# 6-byte digest, instead of hashing with SHA-256 and truncating.
+_POP_KEY = b"sruvaan-pop"
+
+
+def generate_pop_signature(encrypted_fields: Dict[str, str]) -> str:
+    """Proof-of-possession MAC over the encrypted fields."""
+    return hashlib.blake2s(
+        _canonical_bytes(encrypted_fields), digest_size=6, key=_POP_KEY
+    ).hexdigest()
+
+
+def run_cryptor(
+    inp: SemanticPromptOut, theta_params: Optional[dict] = None
+) -> EncryptedOutput:
+    """Encrypt a semantic prompt into HKP field notation."""
+    # inp.model_dump() walks every field; dump at most once per call, and
+    # not at all when neither logging nor the LLM path needs it.
+    semantic_fields = None
+    if logger.isEnabledFor(logging.INFO):
+        semantic_fields = inp.model_dump()
+        logger.info("Encrypting prompt: %s", semantic_fields)
+
+    if _LLM_AVAILABLE:
+        if semantic_fields is None:
+            semantic_fields = inp.model_dump()
+        llm_response = llm_client.call_llm(
+            "cryptor", semantic_fields=_dumps_text(semantic_fields)
+        )
+        parsed = llm_client.parse_json_response(llm_response)
+        if parsed and "encrypted_fields" in parsed:
+            return EncryptedOutput(
+                encrypted_fields=parsed["encrypted_fields"],
+                role_tag=parsed.get("role_tag", "Γ5"),
+                pop_signature=parsed.get("pop_signature")
+                or generate_pop_signature(parsed["encrypted_fields"]),
+                time_tag=parsed.get("time_tag") or _iso_timestamp(),
+            )
+        logger.warning("Cryptor LLM response unusable; using fallback")
+    # Uniform with the other agents: the mode forbids the rule-based
+    # fallback whether the LLM was unreachable or its reply unusable.
+    if _LLM_ONLY:
+        raise RuntimeError("LLM_ONLY_MODE is set but no usable cryptor LLM response")
+
+    auth_level = inp.auth_level or "L0"
+
+    # Stream the canonical payload into the hasher field by field; no
+    # intermediate combined buffer is ever materialized.
+    h = _sha256()
+    h.update(inp.intent.encode())
+    h.update(b"|")
+    h.update(_dumps_canonical(inp.entities))
+    h.update(b"|")
+    h.update(auth_level.encode())
+    # One binary digest; bytes.hex() on 8-byte views is cheaper than
+    # producing a 64-char hexdigest and slicing it four times.
+    d = h.digest()
+
+    time_tag = _iso_timestamp()
+    fields = dict(
+        zip(
+            _FIELD_KEYS,
+            (
+                d[0:8].hex(),
+                d[8:16].hex(),
+                d[16:24].hex(),
+                d[24:32].hex(),
+                auth_level,
+                time_tag,
+            ),
+        )
+    )
+
+    fields.update(apply_hkp_encryption(inp, theta_params))
+
+    pop_signature = generate_pop_signature(fields)
+
+    # model_construct marks the trusted-input path; every field here was
+    # produced above (the slotted records never validate either way).
+    encrypted_output = EncryptedOutput.model_construct(
+        encrypted_fields=fields,
+        role_tag="Γ5",
+        pop_signature=pop_signature,
+        time_tag=time_tag,
+    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Cryptor output=%s", encrypted_output.model_dump())
+    return encrypted_output
+
+
+def run_cryptor_batch(
+    inps: List[SemanticPromptOut], max_workers: int = None
+) -> List[EncryptedOutput]:
+    """Encrypt a batch of prompts, overlapping the hash work across threads.
+
+    OpenSSL's SHA-256 already dispatches to SHA-NI where the CPU has it, and
+    hashlib releases the GIL for large buffers, so a thread pool keeps the
+    hash units busy while amortizing per-call Python overhead.
+    """
+    if not inps:
+        return []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(run_cryptor, inps))
@@ -0,0 +1,118 @@
+"""Decryptor agent: recovers semantic fields from HKP-encrypted tokens.
+
+Verifies the proof-of-possession signature, re-derives the role-gated key
+for each ``βΞ_``-prefixed field and reverses the keystream encryption.
+"""
+
+import hmac
+import logging
+from typing import Dict, Optional
+
+from .cryptor import (
+    ENTITY_PREFIX,
+    _LLM_AVAILABLE,
+    _LLM_ONLY,
+    _derive_role_entry,
+    _dumps_text,
+    _keystream,
+    generate_pop_signature,
+)
+from .llm_client import llm_client
+from .schemas import AUTH_L0, DecryptedFieldsOut, EncryptedOutput
+
+logger = logging.getLogger(__name__)
+
+
+def verify_pop_signature(
+    encrypted_fields: Dict[str, str],
+    expected_signature: str,
+    actual_signature: Optional[str] = None,
+) -> bool:
+    """Compare the PoP MAC against the claimed one in constant time.
+
+    Callers that already hold the freshly computed MAC for these fields
+    (e.g. a driver verifying right after the cryptor signed them) can pass
+    it as *actual_signature* and skip the recomputation.
+    """
+    if actual_signature is None:
+        actual_signature = generate_pop_signature(encrypted_fields)
+    return hmac.compare_digest(actual_signature, expected_signature)
+
+
+def decrypt_field(encrypted_value: str, key) -> str:
+    """Reverse :func:`src.cryptor.encrypt_field` under the same key."""
+    cipher = bytes.fromhex(encrypted_value.partition("_")[2])
+    data = bytes(a ^ b for a, b in zip(cipher, _keystream(key, len(cipher))))
+    return data.decode(errors="replace")
+
+
+def decrypt_hkp_fields(
+    encrypted_fields: Dict[str, str],
+    auth_level: str,
+    theta_params: Optional[dict] = None,
+) -> Dict[str, str]:
+    """Recover every entity field the given auth level can re-key."""
+    # Strip the metadata keys (Ωα, Role=Γ5, Time=∆τ, ...) in one
+    # comprehension pass; the slice compare is cheaper than startswith
+    # dispatch for the fixed three-character prefix.
+    n = len(ENTITY_PREFIX)
+    entities_only = {
+        field_name[n:]: encrypted_value
+        for field_name, encrypted_value in encrypted_fields.items()
+        if field_name[:n] == ENTITY_PREFIX
+    }
+    decrypted = {}
+    for entity_key, encrypted_value in entities_only.items():
+        _, material = _derive_role_entry(entity_key, auth_level, theta_params)
+        decrypted[entity_key] = decrypt_field(encrypted_value, material)
+    return decrypted
+
+
+def run_decryptor(
+    inp: EncryptedOutput, theta_params: Optional[dict] = None
+) -> DecryptedFieldsOut:
+    """Decrypt an :class:`EncryptedOutput` back into semantic fields."""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Decrypting fields: %s", inp.model_dump())
+
+    # Same import-time gate as the cryptor: skip the serialization and
+    # template work entirely when no LLM client exists.
+    if _LLM_AVAILABLE:
+        llm_response = llm_client.call_llm(
+            "decryptor", encrypted_fields=_dumps_text(inp.model_dump())
+        )
+        parsed = llm_client.parse_json_response(llm_response)
+        if parsed and "entities" in parsed:
+            return DecryptedFieldsOut(
+                intent=parsed.get("intent", "unknown"),
+                entities=parsed["entities"],
+                auth_level=parsed.get("auth_level", AUTH_L0),
+                pop_verified=bool(parsed.get("pop_verified", False)),
+                time_tag=parsed.get("time_tag") or inp.time_tag,
+            )
+        logger.warning("Decryptor LLM response unusable; using fallback")
+    # Uniform with the other agents: the mode forbids the rule-based
+    # fallback whether the LLM was unreachable or its reply unusable.
+    if _LLM_ONLY:
+        raise RuntimeError("LLM_ONLY_MODE is set but no usable decryptor LLM response")
+
+    auth_level = inp.encrypted_fields.get("Role=Γ5", AUTH_L0)
+    pop_verified = verify_pop_signature(inp.encrypted_fields, inp.pop_signature)
+    if not pop_verified:
+        logger.warning("PoP signature mismatch; fields may be tampered")
+
+    entities = decrypt_hkp_fields(inp.encrypted_fields, auth_level, theta_params)
+    intent = entities.pop("intent", "unknown")
+
+    # Internal data only; model_construct marks the trusted-input path
+    # even though the slotted records never validate.
+    result = DecryptedFieldsOut.model_construct(
+        intent=intent,
+        entities=entities,
+        auth_level=auth_level,
+        pop_verified=pop_verified,
+        time_tag=inp.time_tag,
+    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Decryptor output=%s", result.model_dump())
+    return result
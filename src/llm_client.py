@@ -0,0 +1,237 @@
+"""Shared LLM client for the pipeline agents.
+
+Wraps the OpenAI and Anthropic SDKs behind a single ``call_llm`` interface
+driven by the agent templates in :mod:`src.config`.  Agents treat a ``None``
+return as "no LLM available" and run their rule-based fallbacks.
+"""
+
+import functools
+import importlib.util
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+
+from . import config as _config
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is the fallback
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+OPENAI_MODEL = "gpt-4o-mini"
+ANTHROPIC_MODEL = "claude-3-5-haiku-latest"
+
+# Compiled once; fenced ```json blocks are the common shape of LLM replies.
+_JSON_BLOCK_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+# orjson.JSONDecodeError subclasses ValueError, so both decoders share the
+# except clauses below.
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _iter_brace_spans(text):
+    """Yield balanced ``{...}`` spans from *text* in one linear pass.
+
+    Tracks brace depth and JSON string/escape state directly instead of
+    using a ``\\{.*\\}`` regex, whose backtracking degenerates on long or
+    malformed LLM output.
+    """
+    depth = 0
+    start = -1
+    in_string = False
+    escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif ch == "}" and depth:
+            depth -= 1
+            if depth == 0:
+                yield text[start : i + 1]
+
+
+class ResponseCache:
+    """Bounded LRU cache with TTL for parsed LLM responses.
+
+    LLM latency dominates every agent that reaches the network, and the
+    feedback loop re-submits structurally identical payloads; a hit here
+    replaces a whole round trip.
+    """
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 24 * 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if time.time() > expires:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = (time.time() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class LLMClient:
+    """Thin provider-agnostic wrapper over the configured LLM SDKs."""
+
+    # Circuit breaker: after this many consecutive failed calls, skip the
+    # network entirely for the cooldown window and let agents run their
+    # rule-based fallbacks instead of re-paying connection latency.
+    _FAIL_THRESHOLD = 5
+    _COOLDOWN_SECONDS = 30.0
+
+    def __init__(self):
+        self._fail_count = 0
+        self._cooldown_until = 0.0
+
+    def _record_failure(self):
+        self._fail_count += 1
+        if self._fail_count >= self._FAIL_THRESHOLD:
+            self._fail_count = 0
+            self._cooldown_until = time.monotonic() + self._COOLDOWN_SECONDS
+            logger.warning(
+                "LLM circuit breaker open for %.0fs after %d failures",
+                self._COOLDOWN_SECONDS,
+                self._FAIL_THRESHOLD,
+            )
+
+    # The SDK imports cost hundreds of milliseconds; defer them until the
+    # first actual LLM call so fallback-only pipelines never pay for them.
+
+    @functools.cached_property
+    def openai_client(self):
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            return None
+        try:
+            import openai
+        except ImportError:
+            logger.debug("openai SDK not installed")
+            return None
+        return openai.OpenAI(api_key=api_key)
+
+    @functools.cached_property
+    def anthropic_client(self):
+        api_key = os.getenv("ANTHROPIC_API_KEY")
+        if not api_key:
+            return None
+        try:
+            import anthropic
+        except ImportError:
+            logger.debug("anthropic SDK not installed")
+            return None
+        return anthropic.Anthropic(api_key=api_key)
+
+    @functools.cached_property
+    def has_any_client(self):
+        """Whether any provider could be constructed, without importing SDKs.
+
+        Checks keys and installed distributions only, so import-time gates
+        (``_LLM_AVAILABLE`` in the agents) stay cheap.  The ``.env`` file
+        is merged into the environment first — the probe result is cached
+        permanently, so keys that live only there must be visible now,
+        not when the full config singleton is eventually built.
+        """
+        _config.load_environment()
+        return bool(
+            (os.getenv("OPENAI_API_KEY") and importlib.util.find_spec("openai"))
+            or (
+                os.getenv("ANTHROPIC_API_KEY")
+                and importlib.util.find_spec("anthropic")
+            )
+        )
+
+    def call_llm(self, agent_name, template=None, **kwargs):
+        """Format the agent's template and query the first configured provider.
+
+        Returns the raw response text, or ``None`` when no provider is
+        configured, no template is known, or the call fails.
+        """
+        if not self.has_any_client:
+            return None
+        if time.monotonic() < self._cooldown_until:
+            return None
+        template = _config.config.get_template(agent_name) or template
+        if template is None:
+            logger.warning("No template for agent %r", agent_name)
+            return None
+
+        user_prompt = template["user_prompt"].format_map(kwargs)
+        system_prompt = template.get("system_prompt", "")
+
+        try:
+            if self.openai_client is not None:
+                response = self.openai_client.chat.completions.create(
+                    model=OPENAI_MODEL,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt},
+                    ],
+                    temperature=0.1,
+                )
+                self._fail_count = 0
+                return response.choices[0].message.content
+            if self.anthropic_client is not None:
+                response = self.anthropic_client.messages.create(
+                    model=ANTHROPIC_MODEL,
+                    max_tokens=1024,
+                    system=system_prompt,
+                    messages=[{"role": "user", "content": user_prompt}],
+                )
+                self._fail_count = 0
+                return response.content[0].text
+        except Exception as exc:
+            logger.warning("LLM call for %r failed: %s", agent_name, exc)
+        # Reached on exception or when neither provider constructed: both
+        # count toward opening the breaker.
+        self._record_failure()
+        return None
+
+    def parse_json_response(self, response):
+        """Extract a JSON object from an LLM reply, tolerating markdown."""
+        if response is None:
+            return None
+        try:
+            return _loads(response)
+        except ValueError:
+            pass
+        match = _JSON_BLOCK_RE.search(response)
+        if match:
+            try:
+                return _loads(match.group(1))
+            except ValueError:
+                pass
+        for candidate in _iter_brace_spans(response):
+            try:
+                return _loads(candidate)
+            except ValueError:
+                continue
+        return None
+
+
+llm_client = LLMClient()
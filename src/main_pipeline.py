@@ -0,0 +1,77 @@
+"""End-to-end pipeline drivers chaining the Sruvaan agents."""
+
+import logging
+
+from .cryptor import run_cryptor
+from .decryptor import run_decryptor
+from .mimicus import run_mimicus
+from .praeceptor import DEFAULT_THETA, run_praeceptor
+from .probator import run_probator
+from .prompter import run_prompter
+from .schemas import DecryptedFieldsOut, RawInstructionInput, ThetaUpdate
+
+logger = logging.getLogger(__name__)
+
+
+def run_pipeline_demo(
+    instruction: str, theta_params: dict = None
+) -> DecryptedFieldsOut:
+    """Run one instruction through prompter -> cryptor -> decryptor.
+
+    Stage outputs are logged with %s placeholders behind isEnabledFor
+    guards, so the model_dump() walks only happen when the records are
+    actually emitted.
+    """
+    log_stages = logger.isEnabledFor(logging.INFO)
+
+    prompter_output = run_prompter(RawInstructionInput(instruction=instruction))
+    if log_stages:
+        logger.info("Prompter output: %s", prompter_output.model_dump())
+
+    cryptor_output = run_cryptor(prompter_output, theta_params)
+    if log_stages:
+        logger.info("Cryptor output: %s", cryptor_output.model_dump())
+
+    decryptor_output = run_decryptor(cryptor_output, theta_params)
+    if log_stages:
+        logger.info("Decryptor output: %s", decryptor_output.model_dump())
+
+    return decryptor_output
+
+
+def _one_iteration(prompter_out, theta: dict) -> ThetaUpdate:
+    """Run one cryptor -> decryptor -> mimicus -> probator -> praeceptor pass.
+
+    Intermediates live only inside this frame: each stage output becomes
+    garbage as soon as the next stage consumed it, so the feedback loop
+    keeps just the prompter output and the latest theta alive between
+    iterations instead of a full set of stage models per iteration.
+    """
+    decryptor_out = run_decryptor(run_cryptor(prompter_out, theta), theta)
+    mimicus_out = run_mimicus(decryptor_out, theta)
+    probator_out = run_probator(mimicus_out, decryptor_out, theta)
+    return run_praeceptor(probator_out, theta)
+
+
+def run_pipeline_with_feedback(
+    instruction: str, theta_params: dict = None, iterations: int = 2
+) -> ThetaUpdate:
+    """Run the full adversarial feedback loop for one instruction.
+
+    The instruction is parsed once; each iteration re-encrypts under the
+    theta parameters calibrated by the previous pass.
+    """
+    prompter_out = run_prompter(RawInstructionInput(instruction=instruction))
+    theta = dict(theta_params) if theta_params else dict(DEFAULT_THETA)
+    update = None
+    for i in range(iterations):
+        update = _one_iteration(prompter_out, theta)
+        theta = update.theta_update
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Iteration %d: mode=%s theta=%s",
+                i + 1,
+                update.calibration_mode,
+                theta,
+            )
+    return update
@@ -0,0 +1,208 @@
+"""Mimicus agent: forges plausible HKP-style fields from decrypted data.
+
+The mimic plays the attacker: given what a decryptor recovered, it fabricates
+field tokens in the same notation so the probator can measure how much of the
+real structure leaks through.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from .llm_client import ResponseCache, llm_client
+from .schemas import DecryptedFieldsOut, MimicOutput
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; scalar draws are the fallback
+    np = None
+
+logger = logging.getLogger(__name__)
+
+_response_cache = ResponseCache()
+
+# Resolved once at import; the mode cannot change mid-process.
+_LLM_ONLY_MODE = os.getenv("LLM_ONLY_MODE", "false").lower() == "true"
+
+# Inclusive-low/exclusive-high bounds for every random draw a mimic can
+# need, in consumption order: Ωα, βΞ (x2), $γΦ, Node_ζτ, date (x3),
+# amount (x2), account quartets (x3). One vectorized draw covers them all.
+_DRAW_LOW = (10, 1, 1, 10, 100, 2020, 1, 1, 1, 0, 1000, 1000, 1000)
+_DRAW_HIGH = (100, 10, 10, 100, 1000, 2030, 13, 29, 10, 1000, 10000, 10000, 10000)
+_DRAW_SPANS = tuple(hi - lo for lo, hi in zip(_DRAW_LOW, _DRAW_HIGH))
+
+if np is not None:
+    _NP_LOW = np.array(_DRAW_LOW)
+    _NP_HIGH = np.array(_DRAW_HIGH)
+    _rng = np.random.default_rng()
+
+
+# Built once at import; the template never varies between calls.
+_MIMICUS_TEMPLATE = {
+    "system_prompt": (
+        "You are an adversarial mimic agent. Given decrypted pipeline "
+        "fields, produce plausible mimic fields an attacker could forge "
+        "and answer with JSON only."
+    ),
+    "user_prompt": (
+        "Generate mimic fields for the following decrypted data:\n\n"
+        "{decrypted_fields}"
+    ),
+}
+
+
+_MIMICUS_BATCH_TEMPLATE = {
+    "system_prompt": _MIMICUS_TEMPLATE["system_prompt"],
+    "user_prompt": (
+        "Generate mimic fields for each entry in the following JSON array "
+        "of decrypted data. Answer with a JSON array of objects in the "
+        "same order:\n\n{decrypted_fields}"
+    ),
+}
+
+
+def create_mimicus_template() -> dict:
+    """Fallback prompt template used when no configured template exists."""
+    return _MIMICUS_TEMPLATE
+
+
+def _draw_batch() -> list:
+    """All random values for one mimic, from a single RNG state update."""
+    if np is not None:
+        return _rng.integers(_NP_LOW, _NP_HIGH).tolist()
+    # One urandom call covers every draw, like the cryptor's prefix pool.
+    # Two bytes per slot keep the modulo bias negligible for the spans
+    # used here (all < 9000).
+    buf = os.urandom(2 * len(_DRAW_LOW))
+    return [
+        lo + int.from_bytes(buf[2 * i : 2 * i + 2], "big") % span
+        for i, (lo, span) in enumerate(zip(_DRAW_LOW, _DRAW_SPANS))
+    ]
+
+
+def generate_mimic_fields(
+    entities: Dict[str, str], auth_level: str
+) -> Dict[str, str]:
+    """Fabricate HKP-shaped field tokens mirroring the decrypted structure."""
+    r = _draw_batch()
+    # Build the dict in one shot from a known-length literal so it
+    # preallocates instead of rehashing across a dozen assignments.
+    mimic_fields = {
+        "Ωα": f"ZYNQ_∆{r[0]}",
+        "βΞ": f"blk_M{r[1]}Z{r[2]}",
+        "$γΦ": f"AKR_{r[3]}",
+        "Node_ζτ": f"E{r[4]}",
+        "Role=Γ5": auth_level,
+        "Time=∆τ": "%04d-%02d-%02d" % (r[5], r[6], r[7]),
+    }
+    if "amount" in entities:
+        mimic_fields["βΞ_amount"] = "$%d,%03d" % (r[8], r[9])
+    if "to_account" in entities:
+        mimic_fields["βΞ_to_account"] = "%04d-%04d-%04d" % (r[10], r[11], r[12])
+    return mimic_fields
+
+
+def analyze_mimic_vulnerabilities(
+    entities: Dict[str, str],
+    auth_level: str,
+    pop_verified: bool,
+    mimic_fields: Dict[str, str],
+) -> List[str]:
+    """List structural weaknesses the mimic was able to exploit."""
+    vulnerabilities = []
+    # Scan the keys directly instead of stringifying (and lowercasing) the
+    # whole dict repr just to run one substring test.
+    if any("account" in key for key in entities):
+        vulnerabilities.append("account structure inferable from recovered fields")
+    if not pop_verified:
+        vulnerabilities.append("missing PoP verification eases forgery")
+    if auth_level in ("L0", "L1"):
+        vulnerabilities.append("low auth level exposes key derivation surface")
+    if len(mimic_fields) >= len(entities) + 6:
+        vulnerabilities.append("full field layout reproduced by mimic")
+    return vulnerabilities
+
+
+def run_mimicus(
+    inp: DecryptedFieldsOut, theta_params: dict = None
+) -> MimicOutput:
+    """Produce a :class:`MimicOutput` for one set of decrypted fields."""
+    # One serialization serves the log record, the cache key, and the LLM
+    # payload; the record is serialized only once per run.
+    payload = inp.model_dump_json()
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Running mimic probe for: %s", payload)
+
+    cache_key = hashlib.sha256(b"mimicus:" + payload.encode()).hexdigest()
+    parsed = _response_cache.get(cache_key)
+    if parsed is None:
+        llm_response = llm_client.call_llm(
+            "mimicus",
+            template=create_mimicus_template(),
+            decrypted_fields=payload,
+        )
+        parsed = llm_client.parse_json_response(llm_response)
+        if parsed is not None:
+            _response_cache.put(cache_key, parsed)
+    if parsed and "mimic_fields" in parsed:
+        result = MimicOutput(
+            mimic_fields=parsed["mimic_fields"],
+            vulnerabilities=parsed.get("vulnerabilities", []),
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Mimicus LLM output: %s", result.model_dump())
+        return result
+    if _LLM_ONLY_MODE:
+        raise RuntimeError("LLM_ONLY_MODE is set but no mimicus LLM response")
+
+    # Pull the model attributes once; the helpers below work on plain
+    # values so the record is traversed a single time per run.
+    entities = inp.entities
+    auth_level = inp.auth_level
+    mimic_fields = generate_mimic_fields(entities, auth_level)
+    vulnerabilities = analyze_mimic_vulnerabilities(
+        entities, auth_level, inp.pop_verified, mimic_fields
+    )
+    result = MimicOutput(
+        mimic_fields=mimic_fields, vulnerabilities=vulnerabilities
+    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Mimicus output: %s", result.model_dump())
+    return result
+
+
+def run_mimicus_batch(
+    inps: List[DecryptedFieldsOut],
+    theta_params: dict = None,
+    max_workers: int = None,
+) -> List[MimicOutput]:
+    """Mimic a batch of decrypted outputs with one LLM round trip.
+
+    All payloads are packed into a single JSON-array prompt, trading N
+    per-item LLM latencies for one. When the response is unusable the
+    rule-based fallback runs per item across a thread pool.
+    """
+    if not inps:
+        return []
+    payload = "[" + ",".join(inp.model_dump_json() for inp in inps) + "]"
+    llm_response = llm_client.call_llm(
+        "mimicus_batch",
+        template=_MIMICUS_BATCH_TEMPLATE,
+        decrypted_fields=payload,
+    )
+    parsed = llm_client.parse_json_response(llm_response)
+    if isinstance(parsed, list) and len(parsed) == len(inps):
+        return [
+            MimicOutput(
+                mimic_fields=item.get("mimic_fields", {}),
+                vulnerabilities=item.get("vulnerabilities", []),
+            )
+            for item in parsed
+        ]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(
+            pool.map(lambda inp: run_mimicus(inp, theta_params), inps)
+        )
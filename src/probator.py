@@ -0,0 +1,260 @@
+"""Probator agent: scores how much structure a mimic leaked.
+
+Compares the mimic fields against the decrypted originals along several
+weighted factors and rates how well the HKP metadata held up.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from .llm_client import ResponseCache, llm_client
+from .schemas import (
+    INTENT_UNKNOWN,
+    DecryptedFieldsOut,
+    LeakageVectorOut,
+    MimicOutput,
+)
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; math.fsum is the fallback
+    np = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is the fallback
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+_response_cache = ResponseCache()
+
+# Resolved once at import; the mode cannot change mid-process.
+_LLM_ONLY_MODE = os.getenv("LLM_ONLY_MODE", "false").lower() == "true"
+
+# Frozen at module scope so every membership test is a C-level set probe
+# instead of a rebuilt list literal scanned by a Python generator.
+_EXPECTED_FIELDS = frozenset(("Ωα", "βΞ", "$γΦ", "Node_ζτ"))
+_HKP_FIELDS = frozenset(("Role=Γ5", "Time=∆τ", "pop_signature"))
+
+# Canonical factor order for the leakage score; semantic_drift (index 2)
+# counts inverted — low drift means the mimic stayed close, i.e. leaked.
+_LEAKAGE_KEYS = (
+    "entity_recovery",
+    "structure_fidelity",
+    "semantic_drift",
+    "pattern_consistency",
+    "field_mapping_accuracy",
+)
+_LEAKAGE_WEIGHTS = (0.3, 0.25, 0.2, 0.15, 0.1)
+
+if np is not None:
+    _NP_WEIGHTS = np.array(_LEAKAGE_WEIGHTS)
+
+# One DFA scan per mimic value replaces the per-field startswith/in chain:
+# group 1 catches the notation markers anchored at the start, group 2 the
+# block marker anywhere. Weights are keyed by (field, marker).
+_PATTERN_RE = re.compile(r"^(ZYNQ|AKR_|E)|(blk_)")
+_PATTERN_WEIGHTS = {
+    ("Ωα", "ZYNQ"): 0.25,
+    ("βΞ", "blk_"): 0.25,
+    ("$γΦ", "AKR_"): 0.25,
+    ("Node_ζτ", "E"): 0.25,
+}
+
+
+# Built once at import; the template never varies between calls.
+_PROBATOR_TEMPLATE = {
+    "system_prompt": (
+        "You are a leakage assessment agent. Compare mimic fields with "
+        "the protected originals and score the information leakage. "
+        "Answer with JSON only."
+    ),
+    "user_prompt": (
+        "Assess the leakage risk of these mimic fields:\n\n{mimic_fields}"
+    ),
+}
+
+
+_PROBATOR_BATCH_TEMPLATE = {
+    "system_prompt": _PROBATOR_TEMPLATE["system_prompt"],
+    "user_prompt": (
+        "Assess the leakage risk of each entry in the following JSON array "
+        "of mimic fields. Answer with a JSON array of objects in the same "
+        "order:\n\n{mimic_fields}"
+    ),
+}
+
+
+def _dumps_sorted(obj) -> str:
+    """Key-sorted JSON text for payloads that double as cache keys."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode()
+    return json.dumps(obj, sort_keys=True)
+
+
+def create_probator_template() -> dict:
+    """Fallback prompt template used when no configured template exists."""
+    return _PROBATOR_TEMPLATE
+
+
+def analyze_leakage_patterns(
+    mimic_fields: Dict[str, str], decrypted_input: DecryptedFieldsOut
+) -> Dict[str, float]:
+    """Score the individual leakage factors for one mimic attempt."""
+    structure_fidelity = len(_EXPECTED_FIELDS & mimic_fields.keys()) / len(
+        _EXPECTED_FIELDS
+    )
+
+    entities = decrypted_input.entities
+    if entities:
+        recovered = [
+            name for name in entities if f"βΞ_{name}" in mimic_fields
+        ]
+        entity_recovery = len(recovered) / len(entities)
+    else:
+        entity_recovery = 0.0
+
+    pattern_consistency = 0.0
+    for key, value in mimic_fields.items():
+        match = _PATTERN_RE.search(value)
+        if match:
+            marker = match.group(1) or "blk_"
+            pattern_consistency += _PATTERN_WEIGHTS.get((key, marker), 0.0)
+
+    # Drift is low when the mimic landed close to the real notation.
+    semantic_drift = 1.0 - (structure_fidelity + pattern_consistency) / 2.0
+    field_mapping_accuracy = (
+        structure_fidelity if decrypted_input.intent != INTENT_UNKNOWN else 0.0
+    )
+
+    return {
+        "entity_recovery": entity_recovery,
+        "structure_fidelity": structure_fidelity,
+        "semantic_drift": semantic_drift,
+        "pattern_consistency": pattern_consistency,
+        "field_mapping_accuracy": field_mapping_accuracy,
+    }
+
+
+def calculate_leakage_score(details: Dict[str, float]) -> float:
+    """Weighted combination of the leakage factors, clamped to [0, 1]."""
+    values = [details.get(key, 0.0) for key in _LEAKAGE_KEYS]
+    values[2] = 1.0 - values[2]
+    if np is not None:
+        score = float(_NP_WEIGHTS @ np.array(values))
+    else:
+        score = math.fsum(w * v for w, v in zip(_LEAKAGE_WEIGHTS, values))
+    return max(0.0, min(1.0, score))
+
+
+def assess_hkp_protection(mimic_fields: Dict[str, str]) -> Dict[str, str]:
+    """Judge whether the protected HKP metadata resisted the mimic."""
+    hkp_present = not _HKP_FIELDS.isdisjoint(mimic_fields)
+    return {
+        "role_protection": "weak" if "Role=Γ5" in mimic_fields else "strong",
+        "time_protection": "weak" if "Time=∆τ" in mimic_fields else "strong",
+        "pop_effectiveness": "weak" if hkp_present else "strong",
+    }
+
+
+def analyze_hkp_effectiveness(hkp_analysis: Dict[str, str]) -> float:
+    """Average the per-field protection verdicts into one score."""
+    # Booleans sum as ints; no intermediate list, one division.
+    score = 0
+    score += hkp_analysis["role_protection"] == "strong"
+    score += hkp_analysis["time_protection"] == "strong"
+    score += hkp_analysis["pop_effectiveness"] == "strong"
+    return score / 3.0
+
+
+def run_probator(
+    mimic_input: MimicOutput,
+    decrypted_input: DecryptedFieldsOut,
+    theta_params: dict = None,
+) -> LeakageVectorOut:
+    """Assess one mimic attempt against the decrypted originals."""
+    mimic_fields = mimic_input.mimic_fields
+    # One serialization serves the log record, the cache key, and the LLM
+    # payload.
+    payload = _dumps_sorted(mimic_fields)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Assessing leakage for: %s", payload)
+
+    cache_key = hashlib.sha256(b"probator:" + payload.encode()).hexdigest()
+    parsed = _response_cache.get(cache_key)
+    if parsed is None:
+        llm_response = llm_client.call_llm(
+            "probator",
+            template=create_probator_template(),
+            mimic_fields=payload,
+        )
+        parsed = llm_client.parse_json_response(llm_response)
+        if parsed is not None:
+            _response_cache.put(cache_key, parsed)
+    if parsed and "leakage_score" in parsed:
+        result = LeakageVectorOut(
+            leakage_score=float(parsed["leakage_score"]),
+            details=parsed.get("details", {}),
+            hkp_score=float(parsed.get("hkp_score", 0.0)),
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Probator LLM output: %s", result.model_dump())
+        return result
+    if _LLM_ONLY_MODE:
+        raise RuntimeError("LLM_ONLY_MODE is set but no probator LLM response")
+
+    details = analyze_leakage_patterns(mimic_fields, decrypted_input)
+    leakage_score = calculate_leakage_score(details)
+    hkp_analysis = assess_hkp_protection(mimic_fields)
+    hkp_score = analyze_hkp_effectiveness(hkp_analysis)
+    result = LeakageVectorOut(
+        leakage_score=leakage_score, details=details, hkp_score=hkp_score
+    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Probator output: %s", result.model_dump())
+    return result
+
+
+def run_probator_batch(
+    mimic_inputs: List[MimicOutput],
+    decrypted_inputs: List[DecryptedFieldsOut],
+    theta_params: dict = None,
+    max_workers: int = None,
+) -> List[LeakageVectorOut]:
+    """Assess a batch of mimic attempts with one LLM round trip.
+
+    Mirrors :func:`src.mimicus.run_mimicus_batch`: one JSON-array prompt
+    instead of N calls, with a thread-pooled rule-based fallback.
+    """
+    if not mimic_inputs:
+        return []
+    payload = _dumps_sorted([m.mimic_fields for m in mimic_inputs])
+    llm_response = llm_client.call_llm(
+        "probator_batch",
+        template=_PROBATOR_BATCH_TEMPLATE,
+        mimic_fields=payload,
+    )
+    parsed = llm_client.parse_json_response(llm_response)
+    if isinstance(parsed, list) and len(parsed) == len(mimic_inputs):
+        return [
+            LeakageVectorOut(
+                leakage_score=float(item.get("leakage_score", 0.0)),
+                details=item.get("details", {}),
+                hkp_score=float(item.get("hkp_score", 0.0)),
+            )
+            for item in parsed
+        ]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(
+            pool.map(
+                lambda pair: run_probator(pair[0], pair[1], theta_params),
+                zip(mimic_inputs, decrypted_inputs),
+            )
+        )
@@ -0,0 +1,565 @@
+"""Prompter agent: parses raw instructions into semantic prompt fields.
+
+Prefers a Groq-hosted LLM for parsing; falls back to rule-based intent and
+entity extraction when no LLM is configured or the response is unusable.
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import os
+import re
+import time
+from types import MappingProxyType
+from typing import List
+
+from . import config as _config
+from .llm_client import ResponseCache
+from .schemas import (
+    AUTH_L4,
+    INTENT_UNKNOWN,
+    STATUS_READY,
+    RawInstructionInput,
+    SemanticPromptOut,
+)
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is the fallback
+    orjson = None
+
+try:
+    import hyperscan
+except ImportError:  # hyperscan is optional; the re patterns are the fallback
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; set matching is the fallback
+    ahocorasick = None
+
+logger = logging.getLogger(__name__)
+
+GROQ_MODEL = "llama-3.1-8b-instant"
+
+# Compiled once at import; the bound-method search skips the re module's
+# per-call argument handling and pattern-cache lookup.
+# The grouped alternative requires at least one comma group, otherwise
+# \d{1,3} would truncate ungrouped amounts like $1000 to their first
+# three digits before the plain-digits alternative is tried.
+_AMOUNT_RE = re.compile(r"\$(\d{1,3}(?:,\d{3})+|\d+)")
+_DEST_RE = re.compile(r"to\s+([A-Za-z\s]+?)(?:\s+from|\s+account|$)")
+_ACCT_RE = re.compile(r"\b(\d{4}-\d{4}-\d{4}(?:-\d{4})?)\b")
+_WORD_RE = re.compile(r"[a-z]+")
+
+# Amount and account extraction are plain regular languages, so when
+# hyperscan is installed one DFA pass over the instruction replaces both
+# NFA searches. Byte offsets only line up with string indexes for ASCII
+# input; the scanner falls back to re otherwise.
+_HS_DB = None
+if hyperscan is not None:
+    try:
+        _HS_DB = hyperscan.Database()
+        _HS_DB.compile(
+            expressions=[
+                rb"\$(\d{1,3}(?:,\d{3})+|\d+)",
+                rb"\b\d{4}-\d{4}-\d{4}(?:-\d{4})?\b",
+            ],
+            ids=[1, 2],
+            flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * 2,
+        )
+    except Exception as exc:  # pragma: no cover - depends on local build
+        logger.debug("hyperscan database unavailable: %s", exc)
+        _HS_DB = None
+
+# Shared read-only result for instructions that match nothing; most
+# throughput workloads hit this path, and every fresh {} was a distinct
+# allocation. model_construct never validates, so the proxy passes
+# through untouched.
+_EMPTY_ENTITIES = MappingProxyType({})
+
+# Numeric literals (amounts, account numbers) the template cache masks out
+# so structurally identical instructions share one LLM response.
+_TEMPLATE_RE = re.compile(r"\$?\d[\d,.\-]*")
+
+# Intent keyword sets; a C-level set intersection against the tokenized
+# instruction replaces three any() generator scans per call.
+_EMAIL_WORDS = frozenset(("email", "mail"))
+_TRANSFER_WORDS = frozenset(("transfer", "send", "move"))
+_BOOK_WORDS = frozenset(("book", "reserve", "schedule"))
+
+# Tie-break order when several keyword families hit, mirroring the
+# original if-cascade: email beats transfer beats booking.
+_INTENT_PRIORITY = {"send_email": 0, "transfer": 1, "book_flight": 2}
+
+# With pyahocorasick installed, one automaton pass finds every keyword
+# hit; the set-intersection path below is the fallback.
+_AC_AUTOMATON = None
+if ahocorasick is not None:
+    _AC_AUTOMATON = ahocorasick.Automaton()
+    for _intent, _words in (
+        ("send_email", _EMAIL_WORDS),
+        ("transfer", _TRANSFER_WORDS),
+        ("book_flight", _BOOK_WORDS),
+    ):
+        for _word in _words:
+            _AC_AUTOMATON.add_word(_word, (len(_word), _intent))
+    _AC_AUTOMATON.make_automaton()
+    del _intent, _words, _word
+
+# Resolved once at import, matching the other agents; the mode cannot
+# change mid-process.
+_LLM_ONLY_MODE = os.getenv("LLM_ONLY_MODE", "false").lower() == "true"
+
+# The groq SDK import and client construction are deferred to first use so
+# `import src.prompter` (and anything that only needs the rule-based path)
+# doesn't pay the SDK's import cost. The SDK is optional; without it the
+# getters return None and the fallback path runs. Each client is built once
+# and shared — the async one pools TCP/TLS sessions across batch calls.
+_sync_client = None
+_sync_client_ready = False
+_async_client = None
+_async_client_ready = False
+
+
+def _get_client():
+    global _sync_client, _sync_client_ready
+    if not _sync_client_ready:
+        _sync_client_ready = True
+        # Merge .env first, then read the key here rather than from an
+        # import-time snapshot that would miss env-file keys.
+        _config.load_environment()
+        api_key = os.getenv("GROQ_API_KEY")
+        if api_key:
+            try:
+                from groq import Groq
+            except ImportError:
+                logger.debug("groq SDK not installed; LLM path disabled")
+            else:
+                _sync_client = Groq(api_key=api_key)
+    return _sync_client
+
+
+def _get_async_client():
+    global _async_client, _async_client_ready
+    if not _async_client_ready:
+        _async_client_ready = True
+        _config.load_environment()
+        api_key = os.getenv("GROQ_API_KEY")
+        if api_key:
+            try:
+                from groq import AsyncGroq
+            except ImportError:
+                logger.debug("groq SDK not installed; LLM path disabled")
+            else:
+                _async_client = AsyncGroq(api_key=api_key)
+    return _async_client
+
+
+# Timestamps are second-granular, so cache the formatted string per
+# second — the same memoization the cryptor uses for its time tags.
+_ts_cache = [0, ""]
+
+
+def _iso_now_z(_time=time.time, _strftime=time.strftime, _gmtime=time.gmtime):
+    # The time functions are bound as defaults so the per-call fast path
+    # (a cache hit) does no module attribute lookups.
+    now = _time()
+    second = int(now)
+    if _ts_cache[0] != second:
+        _ts_cache[0] = second
+        _ts_cache[1] = _strftime("%Y-%m-%dT%H:%M:%SZ", _gmtime(now))
+    return _ts_cache[1]
+
+
+def _loads(text):
+    """Parse a JSON document, through orjson's C path when available."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+# The prompt around the instruction is constant; holding it as a prefix and
+# suffix means building the final prompt is a single concatenation instead of
+# re-interpolating the whole template every call.
+_PROMPT_PREFIX = """You are an instruction parser for a secure execution pipeline.
+
+Parse the instruction below into its semantic fields.
+
+Instruction:
+\"\"\""""
+
+_PROMPT_SUFFIX = """\"\"\"
+
+Return ONLY a JSON object with these keys:
+- intent: one of "transfer", "send_email", "book_flight", or "unknown"
+- entities: object mapping entity names (amount, from_account, to_account,
+  destination, ...) to string values
+- auth_level: authorization level, default "L4"
+- timestamp: ISO-8601 UTC timestamp or null
+- status: short execution status, default "ready for execution"
+
+No prose, no markdown fences, JSON only."""
+
+
+# Concatenated once at import; callers share the same interned string
+# instead of re-joining the template on every call.
+_PROMPTER_TEMPLATE = _PROMPT_PREFIX + "{instruction}" + _PROMPT_SUFFIX
+
+
+def create_prompter_template() -> str:
+    """Prompt template sent to the LLM, with an ``{instruction}`` slot."""
+    return _PROMPTER_TEMPLATE
+
+
+def _build_prompt(instruction: str) -> str:
+    return _PROMPT_PREFIX + instruction + _PROMPT_SUFFIX
+
+
+def extract_intent(instruction: str, instruction_lower: str = None) -> str:
+    """Rule-based intent classification for the LLM-free path.
+
+    Callers that already hold a lowered copy of the instruction can pass
+    it as *instruction_lower* to skip the extra pass.
+    """
+    if instruction_lower is None:
+        instruction_lower = instruction.lower()
+    if _AC_AUTOMATON is not None:
+        # One linear automaton pass over the text; hits inside larger
+        # words are rejected by checking the surrounding characters, so
+        # this keeps the tokenized semantics of the fallback below.
+        best = len(_INTENT_PRIORITY)
+        best_intent = INTENT_UNKNOWN
+        last = len(instruction_lower) - 1
+        for end, (word_len, intent) in _AC_AUTOMATON.iter(instruction_lower):
+            start = end - word_len + 1
+            if start > 0 and instruction_lower[start - 1].isalpha():
+                continue
+            if end < last and instruction_lower[end + 1].isalpha():
+                continue
+            priority = _INTENT_PRIORITY[intent]
+            if priority < best:
+                best = priority
+                best_intent = intent
+                if best == 0:
+                    break
+        return best_intent
+    tokens = set(_WORD_RE.findall(instruction_lower))
+    if tokens & _EMAIL_WORDS:
+        return "send_email"
+    if tokens & _TRANSFER_WORDS:
+        return "transfer"
+    if tokens & _BOOK_WORDS:
+        return "book_flight"
+    return INTENT_UNKNOWN
+
+
+def _scan_amount_accounts(instruction: str):
+    """First amount and all account tokens, as ``(amount, [(start, text)])``.
+
+    Uses the hyperscan DFA when available for ASCII input — one linear
+    pass finds both pattern families — and the compiled re patterns
+    otherwise.
+    """
+    if _HS_DB is not None and instruction.isascii():
+        # Hyperscan reports a match at every viable end offset; keep the
+        # longest per (pattern, start), then drop overlaps so a 16-digit
+        # account does not also surface its embedded 12-digit suffix.
+        found = {}
+
+        def _on_match(pat_id, start, end, flags, context):
+            key = (pat_id, start)
+            if end > found.get(key, -1):
+                found[key] = end
+
+        _HS_DB.scan(instruction.encode(), match_event_handler=_on_match)
+        amount = None
+        accounts = []
+        prev_end = {1: -1, 2: -1}
+        for (pat_id, start), end in sorted(
+            found.items(), key=lambda item: item[0][1]
+        ):
+            if start < prev_end[pat_id]:
+                continue
+            prev_end[pat_id] = end
+            if pat_id == 1:
+                if amount is None:
+                    amount = instruction[start:end]
+            else:
+                accounts.append((start, instruction[start:end]))
+        return amount, accounts
+
+    match = _AMOUNT_RE.search(instruction)
+    amount = match.group(0) if match else None
+    accounts = [(m.start(), m.group(1)) for m in _ACCT_RE.finditer(instruction)]
+    return amount, accounts
+
+
+def _entities_from_scan(instruction: str, amount, accounts) -> dict:
+    """Assemble the entity dict from pre-scanned amount/account matches."""
+    entities = {}
+
+    if amount:
+        entities["amount"] = amount.lstrip("$").replace(",", "")
+
+    # One linear scan for account numbers instead of a chain of literal
+    # substring checks; direction comes from the nearest preceding
+    # to/from token, defaulting to from-then-to order on a tie.
+    if len(accounts) == 1:
+        entities["account"] = accounts[0][1]
+    elif accounts:
+        roles = []
+        for start, _ in accounts[:2]:
+            to_pos = instruction.rfind(" to ", 0, start)
+            from_pos = instruction.rfind(" from ", 0, start)
+            roles.append("to_account" if to_pos > from_pos else "from_account")
+        if roles[0] == roles[1]:
+            roles = ["from_account", "to_account"]
+        entities[roles[0]] = accounts[0][1]
+        entities[roles[1]] = accounts[1][1]
+
+    match = _DEST_RE.search(instruction)
+    if match:
+        entities["destination"] = match.group(1).strip()
+
+    return entities or _EMPTY_ENTITIES
+
+
+def extract_entities(instruction: str) -> dict:
+    """Rule-based entity extraction for the LLM-free path."""
+    amount, accounts = _scan_amount_accounts(instruction)
+    return _entities_from_scan(instruction, amount, accounts)
+
+
+# Field defaults for LLM replies; one dict merge replaces five .get
+# lookups, and the key set doubles as the filter for unexpected keys.
+_LLM_DEFAULTS = {
+    "intent": INTENT_UNKNOWN,
+    "entities": {},
+    "auth_level": AUTH_L4,
+    "timestamp": None,
+    "status": STATUS_READY,
+}
+
+
+def _result_from_parsed(parsed_response: dict) -> SemanticPromptOut:
+    """Build the output model from a parsed LLM reply."""
+    merged = {**_LLM_DEFAULTS, **parsed_response}
+    if len(merged) > len(_LLM_DEFAULTS):
+        # The reply carried keys outside the schema; drop them rather
+        # than passing unknown kwargs to the record constructor.
+        merged = {key: merged[key] for key in _LLM_DEFAULTS}
+    if not merged["timestamp"]:
+        merged["timestamp"] = _iso_now_z()
+    result = SemanticPromptOut(**merged)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Prompter LLM output: %s", result.model_dump())
+    return result
+
+
+def _fallback_result(instruction: str) -> SemanticPromptOut:
+    """Build the output model via the rule-based path."""
+    # Internal extractor output only; model_construct marks the
+    # trusted-input path even though the slotted records never validate.
+    result = SemanticPromptOut.model_construct(
+        intent=extract_intent(instruction),
+        entities=extract_entities(instruction),
+        auth_level=AUTH_L4,
+        timestamp=_iso_now_z(),
+        status=STATUS_READY,
+    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Prompter fallback output: %s", result.model_dump())
+    return result
+
+
+# Parsed LLM replies keyed on the number-masked instruction; hits serve
+# any instruction that differs only in its numeric literals.
+_template_cache = ResponseCache(maxsize=4096)
+
+# Canonical forms a response value may take for one captured slot: as
+# written, without the dollar sign, and without sign or commas.
+def _slot_forms(slot: str) -> tuple:
+    bare = slot.lstrip("$")
+    return (slot, bare, bare.replace(",", ""))
+
+
+def _templatize_parsed(parsed: dict, slots: List[str]):
+    """Replace slot-derived entity values with positional markers.
+
+    Returns a copy of *parsed* where any entity value that echoes one of
+    the instruction's numeric literals becomes a ``(slot_index, form)``
+    marker, so a cache hit can splice in the numbers from the new
+    instruction instead of replaying stale ones.  Returns ``None`` when a
+    numeric-looking value matches no slot form (e.g. the LLM rewrote
+    ``$500`` as ``500.00``) — caching that reply would replay the stale
+    number for every structurally identical instruction.
+    """
+    form_index = {}
+    for i, slot in enumerate(slots):
+        forms = _slot_forms(slot)
+        # Walk most-normalized first so ambiguous values (e.g. "500"
+        # matching both bare forms) refill in stripped form.
+        for form in (2, 1, 0):
+            form_index.setdefault(forms[form], (i, form))
+    entities = {}
+    for key, value in parsed.get("entities", {}).items():
+        marker = form_index.get(value) if isinstance(value, str) else None
+        if marker is None:
+            if isinstance(value, str) and _TEMPLATE_RE.fullmatch(value):
+                return None
+            entities[key] = value
+        else:
+            entities[key] = marker
+    templated = dict(parsed)
+    templated["entities"] = entities
+    return templated
+
+
+def _fill_parsed(templated: dict, slots: List[str]) -> dict:
+    """Resolve slot markers in a cached reply against the current slots."""
+    entities = {}
+    for key, value in templated["entities"].items():
+        if type(value) is tuple:
+            index, form = value
+            entities[key] = _slot_forms(slots[index])[form]
+        else:
+            entities[key] = value
+    filled = dict(templated)
+    filled["entities"] = entities
+    return filled
+
+
+def _llm_parse(instruction: str) -> SemanticPromptOut:
+    """LLM round-trip with a structural response cache.
+
+    The cache key masks numeric literals, so "Transfer $500 to X" hits
+    the entry populated by "Transfer $900 to X" and gets the current
+    numbers substituted back in — repeat-shaped workloads skip the
+    network entirely.  Exceptions propagate uncached, so transient
+    failures are retried on the next call.
+    """
+    slots = _TEMPLATE_RE.findall(instruction)
+    template_key = _TEMPLATE_RE.sub("<NUM>", instruction)
+    templated = _template_cache.get(template_key)
+    if templated is not None:
+        return _result_from_parsed(_fill_parsed(templated, slots))
+    prompt = _build_prompt(instruction)
+    response = _get_client().chat.completions.create(
+        model=GROQ_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.1,
+    )
+    parsed = _loads(response.choices[0].message.content)
+    templated = _templatize_parsed(parsed, slots)
+    if templated is not None:
+        _template_cache.put(template_key, templated)
+    return _result_from_parsed(parsed)
+
+
+def run_prompter(inp: RawInstructionInput) -> SemanticPromptOut:
+    """Parse an instruction into a :class:`SemanticPromptOut`."""
+    logger.info("Parsing instruction: %s", inp.instruction)
+    instruction = inp.instruction
+
+    # Rule-first prefilter: when the regex side parses the instruction
+    # with confidence (a known intent plus the entities that intent
+    # needs), skip the LLM round-trip entirely — the dominant case goes
+    # from network latency to microseconds.
+    if not _LLM_ONLY_MODE:
+        intent = extract_intent(instruction, instruction.lower())
+        if intent != INTENT_UNKNOWN:
+            entities = extract_entities(instruction)
+            if "amount" in entities or intent in ("book_flight", "send_email"):
+                return SemanticPromptOut.model_construct(
+                    intent=intent,
+                    entities=entities,
+                    auth_level=AUTH_L4,
+                    timestamp=_iso_now_z(),
+                    status=STATUS_READY,
+                )
+
+    if _get_client() is not None:
+        try:
+            return _llm_parse(instruction)
+        except Exception as exc:
+            logger.warning("Groq parse failed, using fallback: %s", exc)
+
+    if _LLM_ONLY_MODE:
+        raise RuntimeError(
+            "LLM_ONLY_MODE is enabled but no usable LLM response was produced"
+        )
+
+    return _fallback_result(inp.instruction)
+
+
+async def _parse_one_async(aclient, inp: RawInstructionInput):
+    try:
+        prompt = _build_prompt(inp.instruction)
+        response = await aclient.chat.completions.create(
+            model=GROQ_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.1,
+        )
+        return _result_from_parsed(_loads(response.choices[0].message.content))
+    except Exception as exc:
+        logger.warning("Groq batch parse failed, using fallback: %s", exc)
+        return _fallback_result(inp.instruction)
+
+
+def _fallback_batch(instructions: List[str]) -> List[SemanticPromptOut]:
+    """Rule-based parse of many instructions with one corpus scan.
+
+    The instructions are joined on an unprintable sentinel and each
+    numeric pattern runs once over the whole corpus; match offsets map
+    back to their instruction by bisecting the segment starts.  The
+    sentinel cannot occur inside an amount or account token, so no match
+    straddles two instructions.
+    """
+    starts = [0]
+    for instruction in instructions[:-1]:
+        starts.append(starts[-1] + len(instruction) + 1)
+    corpus = "\x1f".join(instructions)
+
+    amounts = [None] * len(instructions)
+    accounts = [[] for _ in instructions]
+    for match in _AMOUNT_RE.finditer(corpus):
+        i = bisect.bisect_right(starts, match.start()) - 1
+        if amounts[i] is None:
+            amounts[i] = match.group(0)
+    for match in _ACCT_RE.finditer(corpus):
+        i = bisect.bisect_right(starts, match.start()) - 1
+        accounts[i].append((match.start() - starts[i], match.group(1)))
+
+    timestamp = _iso_now_z()
+    return [
+        SemanticPromptOut.model_construct(
+            intent=extract_intent(instruction),
+            entities=_entities_from_scan(instruction, amounts[i], accounts[i]),
+            auth_level=AUTH_L4,
+            timestamp=timestamp,
+            status=STATUS_READY,
+        )
+        for i, instruction in enumerate(instructions)
+    ]
+
+
+async def run_prompter_batch(
+    inputs: List[RawInstructionInput],
+) -> List[SemanticPromptOut]:
+    """Parse a batch of instructions with overlapped LLM round-trips.
+
+    Issues all requests concurrently through a shared ``AsyncGroq`` client,
+    so wall time is bounded by the slowest reply rather than the sum of
+    round-trips.  Without any configured LLM the rule-based fallback runs
+    over the whole batch in one corpus scan.
+    """
+    aclient = _get_async_client()
+    if aclient is None:
+        if _get_client() is None and not _LLM_ONLY_MODE and inputs:
+            return _fallback_batch([inp.instruction for inp in inputs])
+        return [run_prompter(inp) for inp in inputs]
+    return list(
+        await asyncio.gather(*(_parse_one_async(aclient, inp) for inp in inputs))
+    )
@@ -0,0 +1,130 @@
+"""Schemas shared by the pipeline agents.
+
+:class:`RawInstructionInput` stays a pydantic model — it sits on the
+external boundary and needs validation.  The agent-to-agent records only
+shuttle already-validated data between trusted stages, so they are
+slotted frozen dataclasses instead: no per-instance ``__dict__``, no
+validator machinery, faster attribute access.  A small mixin keeps the
+pydantic v2 method names (``model_dump`` etc.) so call sites are
+agnostic to the change.
+"""
+
+import copy
+import json
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is the fallback
+    orjson = None
+
+
+# Interned once and referenced everywhere these values recur, so dict
+# hashing and equality on them short-circuit to pointer comparison.
+# Multi-word literals like the status strings are not auto-interned by
+# the compiler.
+AUTH_L4 = sys.intern("L4")
+AUTH_L0 = sys.intern("L0")
+ROLE_G5 = sys.intern("Γ5")
+INTENT_UNKNOWN = sys.intern("unknown")
+STATUS_READY = sys.intern("ready for execution")
+
+
+class RawInstructionInput(BaseModel):
+    """Unparsed natural-language instruction entering the pipeline."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    instruction: str
+
+
+class _RecordMixin:
+    """Pydantic-v2-shaped helpers for the slotted record dataclasses."""
+
+    __slots__ = ()
+
+    def model_dump(self) -> dict:
+        return {
+            name: getattr(self, name) for name in self.__dataclass_fields__
+        }
+
+    def model_dump_json(self) -> str:
+        # default=dict lets mapping proxies (the prompter's shared
+        # empty-entities singleton) serialize as their backing dict.
+        if orjson is not None:
+            return orjson.dumps(self.model_dump(), default=dict).decode()
+        return json.dumps(self.model_dump(), default=dict)
+
+    def model_copy(self):
+        return copy.copy(self)
+
+    @classmethod
+    def model_construct(cls, **kwargs):
+        # Dataclass construction never validates, so this is just the
+        # regular constructor kept under the pydantic name.
+        return cls(**kwargs)
+
+
+@dataclass(frozen=True, slots=True)
+class SemanticPromptOut(_RecordMixin):
+    """Structured interpretation of an instruction produced by the prompter."""
+
+    intent: str
+    entities: Dict[str, str]
+    auth_level: str = AUTH_L4
+    timestamp: Optional[str] = None
+    status: str = STATUS_READY
+
+
+@dataclass(frozen=True, slots=True)
+class EncryptedOutput(_RecordMixin):
+    """HKP-encrypted representation of a semantic prompt."""
+
+    encrypted_fields: Dict[str, str]
+    pop_signature: str
+    time_tag: str
+    role_tag: str = ROLE_G5
+
+
+@dataclass(frozen=True, slots=True)
+class MimicOutput(_RecordMixin):
+    """Adversarial mimic of the encrypted field notation."""
+
+    mimic_fields: Dict[str, str]
+    vulnerabilities: List[str] = field(default_factory=list)
+    status: str = "mimic generated"
+
+
+@dataclass(frozen=True, slots=True)
+class LeakageVectorOut(_RecordMixin):
+    """Leakage assessment comparing mimic fields to the protected originals."""
+
+    leakage_score: float
+    details: Dict[str, float]
+    hkp_score: float = 0.0
+    status: str = "leakage assessed"
+
+
+@dataclass(frozen=True, slots=True)
+class ThetaUpdate(_RecordMixin):
+    """Calibrated cipher parameters proposed by the praeceptor."""
+
+    theta_update: Dict[str, float]
+    calibration_mode: str = "maintain"
+    status: str = "calibrated"
+
+
+@dataclass(frozen=True, slots=True)
+class DecryptedFieldsOut(_RecordMixin):
+    """Semantic fields recovered from an :class:`EncryptedOutput`."""
+
+    intent: str = INTENT_UNKNOWN
+    entities: Dict[str, str] = field(default_factory=dict)
+    auth_level: str = AUTH_L0
+    pop_verified: bool = False
+    time_tag: Optional[str] = None
+    status: str = "decrypted"